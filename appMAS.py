@@ -1,28 +1,686 @@
+import time
+
+# Tiempos de las importaciones de nivel superior (nombre -> segundos); se vuelcan en get_import_times().
+# Bajo `streamlit run` el servidor ya cargó Streamlit (y con él Plotly) antes de ejecutar el script, así que
+# allí miden lo que paga el script; `python appMAS.py --import-times` mide el arranque en frío de un proceso nuevo.
+_top_level_import_times = {}
+_t0 = time.perf_counter()
 import streamlit as st
+_top_level_import_times['streamlit'] = time.perf_counter() - _t0
+_t0 = time.perf_counter()
 import numpy as np
+_top_level_import_times['numpy'] = time.perf_counter() - _t0
+_t0 = time.perf_counter()
 import plotly.graph_objects as go
-from scipy.integrate import odeint
-import time 
+import plotly.io as pio
+_top_level_import_times['plotly'] = time.perf_counter() - _t0
+
+import sys
+import importlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# --- Carga Diferida de Módulos Pesados ---
+
+# Registro de tiempos de carga (nombre -> segundos), compartido durante toda la vida del proceso
+@st.cache_resource
+def get_import_times():
+    return {}
+
+for _name, _seconds in _top_level_import_times.items():
+    get_import_times().setdefault(_name, _seconds)
+
+# Importa un módulo solo cuando una sección lo necesita y registra cuánto tardó la primera vez.
+# Solo SciPy se carga así: Plotly ya lo importa Streamlit, así que diferirlo no ahorraría nada
+def lazy_import(module_name):
+    import_times = get_import_times()
+    if module_name in import_times:
+        return sys.modules[module_name]
+    t0 = time.perf_counter()
+    module = importlib.import_module(module_name)
+    import_times.setdefault(module_name, time.perf_counter() - t0)
+    return module
 
 # --- Funciones de Simulación (ODEs) ---
+# Todas devuelven arreglos y aceptan y con forma (2,) o (2, n) para evaluar varios estados a la vez
 
 # Ecuación diferencial para el Péndulo Simple (No Lineal)
 def pendulum_ode(y, t, g, L):
     theta, omega = y
-    dydt = [omega, - (g / L) * np.sin(theta)]
-    return dydt
+    return np.array([omega, - (g / L) * np.sin(theta)])
 
 # Ecuación diferencial para el MAS con Amortiguamiento (Modelo Lineal)
 def damped_mas_ode(y, t, k, m, c):
     x, v = y
-    dydt = [v, - (c / m) * v - (k / m) * x]
-    return dydt
+    return np.array([v, - (c / m) * v - (k / m) * x])
 
 # Ecuación diferencial para el MAS Forzado (Modelo Lineal)
 def forced_mas_ode(y, t, k, m, c, F0, w_f):
     x, v = y
-    dydt = [v, - (c / m) * v - (k / m) * x + (F0 / m) * np.cos(w_f * t)]
-    return dydt
+    return np.array([v, - (c / m) * v - (k / m) * x + (F0 / m) * np.cos(w_f * t)])
+
+# --- Jacobianos Analíticos (misma firma que las ODE) ---
+
+def pendulum_jac(y, t, g, L):
+    return np.array([[0.0, 1.0], [- (g / L) * np.cos(y[0]), 0.0]])
+
+def damped_mas_jac(y, t, k, m, c):
+    return np.array([[0.0, 1.0], [- k / m, - c / m]])
+
+def forced_mas_jac(y, t, k, m, c, F0, w_f):
+    return damped_mas_jac(y, t, k, m, c)
+
+# --- Soluciones Analíticas ---
+
+# Tolerancia relativa con que c se considera igual al amortiguamiento crítico c_c = 2*sqrt(k*m)
+CRITICAL_RTOL = 1e-9
+
+# MAS amortiguado libre desde y0 = [x0, v0] para varios coeficientes c a la vez (una fila por c);
+# cada régimen se evalúa vectorizado sobre sus filas. Devuelve (x, v), ambos con forma (len(c), len(t))
+def damped_mas_analytic_batch(y0, t, k, m, c_values):
+    x0, v0 = y0
+    c_values = np.atleast_1d(np.asarray(c_values, dtype=float))
+    t = np.asarray(t, dtype=float)[None, :]
+    gamma_all = c_values / (2 * m)
+    omega_0 = np.sqrt(k / m)
+    x = np.empty((len(c_values), t.shape[1]))
+    v = np.empty_like(x)
+
+    critical = np.isclose(gamma_all, omega_0, rtol=CRITICAL_RTOL, atol=0.0)
+    under = ~critical & (gamma_all < omega_0)
+    over = ~critical & ~under
+
+    if critical.any():
+        # Crítico: x = e^(-γt) (a + b t)
+        gamma = gamma_all[critical, None]
+        a, b = x0, v0 + gamma * x0
+        decay = np.exp(-gamma * t)
+        x[critical] = decay * (a + b * t)
+        v[critical] = decay * (b - gamma * (a + b * t))
+    if under.any():
+        # Subamortiguado: x = e^(-γt) (a cos ω_d t + b sin ω_d t)
+        gamma = gamma_all[under, None]
+        omega_d = np.sqrt(omega_0**2 - gamma**2)
+        a, b = x0, (v0 + gamma * x0) / omega_d
+        decay = np.exp(-gamma * t)
+        cos_t, sin_t = np.cos(omega_d * t), np.sin(omega_d * t)
+        x[under] = decay * (a * cos_t + b * sin_t)
+        v[under] = decay * ((b * omega_d - gamma * a) * cos_t - (a * omega_d + gamma * b) * sin_t)
+    if over.any():
+        # Sobreamortiguado: x = e^(-γt) (a cosh βt + b sinh βt), con las exponenciales combinadas para evitar desbordes
+        gamma = gamma_all[over, None]
+        beta = np.sqrt(gamma**2 - omega_0**2)
+        a, b = x0, (v0 + gamma * x0) / beta
+        slow, fast = np.exp((beta - gamma) * t), np.exp(-(beta + gamma) * t)
+        cosh_t, sinh_t = 0.5 * (slow + fast), 0.5 * (slow - fast)
+        x[over] = a * cosh_t + b * sinh_t
+        v[over] = (b * beta - gamma * a) * cosh_t + (a * beta - gamma * b) * sinh_t
+    return x, v
+
+# MAS amortiguado libre desde y0 = [x0, v0] con un solo c; devuelve columnas [x, v]
+def damped_mas_analytic(y0, t, k, m, c):
+    x, v = damped_mas_analytic_batch(y0, t, k, m, [c])
+    return np.column_stack([x[0], v[0]])
+
+# --- Registro de Modelos de Osciladores ---
+
+# Cociente de rigidez de un oscilador lineal: max|Re λ| / min|Re λ| de la matriz [[0, 1], [-k/m, -c/m]]
+def linear_stiffness(k, m, c):
+    re = np.abs(np.linalg.eigvals(damped_mas_jac(None, 0.0, k, m, c)).real)
+    return re.max() / re.min() if re.min() > 0 else 1.0
+
+# Cada modelo declara su RHS, su Jacobiano, una solución cerrada (si existe) y metadatos para elegir el integrador
+OSCILLATOR_MODELS = {
+    'pendulum': {
+        'rhs': pendulum_ode, 'jac': pendulum_jac, 'analytic': None,
+        'linear': False, 'conservative': True,
+        'stiffness': lambda g, L: 1.0,
+    },
+    'damped': {
+        'rhs': damped_mas_ode, 'jac': damped_mas_jac, 'analytic': damped_mas_analytic,
+        'linear': True, 'conservative': False,
+        'stiffness': linear_stiffness,
+    },
+    'forced': {
+        'rhs': forced_mas_ode, 'jac': forced_mas_jac, 'analytic': None,
+        'linear': True, 'conservative': False,
+        'stiffness': lambda k, m, c, F0, w_f: linear_stiffness(k, m, c),
+    },
+}
+
+# A partir de este cociente de rigidez se entrega el Jacobiano analítico a LSODA para su fase BDF
+STIFFNESS_THRESHOLD = 100.0
+
+# Tolerancias por defecto de odeint. El error que dejan (< 2e-5 relativo incluso en el péndulo a 170° durante 30 s)
+# ya está por debajo de lo que muestran los gráficos (float32, píxeles); ajustarlas más solo añade evaluaciones de f
+SOLVER_RTOL = 1.49012e-8
+SOLVER_ATOL = 1.49012e-8
+
+# Elige método y tolerancias a partir de los metadatos del modelo
+def select_solver(model, args):
+    if model['analytic'] is not None:
+        return {'method': 'Analítico'}
+    options = {'method': 'LSODA', 'rtol': SOLVER_RTOL, 'atol': SOLVER_ATOL}
+    if model['stiffness'](*args) > STIFFNESS_THRESHOLD:
+        options['method'] = 'LSODA + Jacobiano analítico'
+        options['jac'] = model['jac']
+    return options
+
+# Texto de estadísticas del integrador para mostrar bajo cada gráfico
+def format_solver_stats(stats):
+    steps = stats['nsteps'] if stats['nsteps'] is not None else "no disponible"
+    return (f"🧮 Integrador: **{stats['method']}** | Pasos: {steps} | Evaluaciones de $f$: {stats['nfev']} | "
+            f"Evaluaciones del Jacobiano analítico: {stats['njev']}")
+
+# --- Ejecución de Solvers en Segundo Plano ---
+
+# Si la sesión que espera un trabajo deja de sondearlo durante este tiempo (cambió de sección o cerró la pestaña),
+# el trabajo se da por abandonado y se detiene
+SOLVER_ABANDON_TIMEOUT = 2.0
+
+# El LSODA de SciPy guarda su estado por instancia a partir de la 1.17 (antes usaba bloques COMMON de Fortran
+# compartidos por todo el proceso): con versiones anteriores las integraciones deben ir de una en una
+def lsoda_is_reentrant():
+    version = lazy_import('scipy').__version__
+    return tuple(int(part) for part in version.split('.')[:2]) >= (1, 17)
+
+# Máximo de pasos internos de LSODA entre dos puntos de salida (el valor por defecto, 500, se agota con
+# forzamientos muy rápidos frente al espaciado de `t`)
+SOLVER_MAX_STEPS = 100000
+
+# Pool de hilos compartido por todas las sesiones del servidor
+@st.cache_resource
+def get_solver_pool():
+    workers = 4 if lsoda_is_reentrant() else 1
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mas-solver")
+
+# Resuelve el modelo `model_key` con el método elegido. La integración numérica usa un único LSODA que se avanza
+# de un punto de `t` al siguiente sin reiniciarse (conserva paso, orden y fase rígida/no rígida); entre puntos
+# revisa la cancelación y el latido (`heartbeat`) de la sesión que espera. Devuelve (solución, estadísticas),
+# o None si se cancela; lanza RuntimeError si LSODA no logra avanzar.
+def solve_ode_stepped(model_key, y0, t, args, cancel_event, progress, heartbeat=None):
+    model = OSCILLATOR_MODELS[model_key]
+    options = select_solver(model, args)
+    stats = {'method': options.pop('method'), 'nsteps': None, 'nfev': 0, 'njev': 0}
+
+    if model['analytic'] is not None:
+        progress[0] = 1.0
+        stats['nsteps'] = 0
+        return model['analytic'](y0, t, *args), stats
+
+    rhs, jac = model['rhs'], options.pop('jac', None)
+
+    def f(t_, y):
+        stats['nfev'] += 1
+        return rhs(y, t_, *args)
+
+    def f_jac(t_, y):
+        stats['njev'] += 1
+        return jac(y, t_, *args)
+
+    solver = lazy_import('scipy.integrate').ode(f, f_jac if jac is not None else None)
+    solver.set_integrator('lsoda', nsteps=SOLVER_MAX_STEPS, **options)
+    solver.set_initial_value(y0, t[0])
+    sol = np.empty((len(t), len(y0)))
+    sol[0] = y0
+    for i in range(1, len(t)):
+        if cancel_event.is_set():
+            return None
+        if heartbeat is not None and time.monotonic() - heartbeat[0] > SOLVER_ABANDON_TIMEOUT:
+            cancel_event.set()
+            return None
+        sol[i] = solver.integrate(t[i])
+        if not solver.successful():
+            raise RuntimeError(f"LSODA falló en t = {solver.t:.4g} s (código {solver.get_return_code()})")
+        progress[0] = i / (len(t) - 1)
+    # SciPy no expone el número de pasos: se lee NST (iwork[10]) del vector de trabajo de LSODA si está disponible
+    iwork = getattr(getattr(solver, '_integrator', None), 'iwork', None)
+    if iwork is not None and len(iwork) > 10:
+        stats['nsteps'] = int(iwork[10])
+    return sol, stats
+
+# Envía la integración al pool (un trabajo por `name` en la sesión) y espera su resultado.
+# Si los parámetros cambian, el trabajo anterior se cancela y solo se entrega el más reciente;
+# un trabajo abandonado (sin nadie esperándolo) se detiene solo y se vuelve a enviar si se pide de nuevo.
+def run_solver_job(name, model_key, y0, t, args):
+    params = (model_key, tuple(y0), float(t[0]), float(t[-1]), len(t), tuple(args))
+    jobs = st.session_state.setdefault('solver_jobs', {})
+    job = jobs.get(name)
+
+    if job is None or job['params'] != params or job['cancel'].is_set():
+        if job is not None:
+            job['cancel'].set()
+            job['future'].cancel()
+        job = {'params': params, 'cancel': threading.Event(), 'progress': [0.0], 'heartbeat': [time.monotonic()]}
+        job['future'] = get_solver_pool().submit(
+            solve_ode_stepped, model_key, y0, t, args, job['cancel'], job['progress'], job['heartbeat']
+        )
+        jobs[name] = job
+
+    if not job['future'].done():
+        # Cada actualización de la barra permite a Streamlit interrumpir el script si cambia un parámetro
+        progress_bar = st.progress(0.0, text="Resolviendo la ecuación diferencial...")
+        while not job['future'].done():
+            job['heartbeat'][0] = time.monotonic()
+            progress_bar.progress(job['progress'][0], text="Resolviendo la ecuación diferencial...")
+            time.sleep(0.05)
+        progress_bar.empty()
+
+    try:
+        return job['future'].result()
+    except RuntimeError as error:
+        # Se descarta el trabajo fallido para que la siguiente ejecución lo reintente en lugar de repetir el error
+        jobs.pop(name, None)
+        st.error(f"No se pudo resolver la ecuación diferencial: {error}. Pruebe con otros parámetros.")
+        st.stop()
+
+# --- Barrido de Regímenes de Amortiguamiento ---
+
+# Barrido de c/c_c = 0, 0.01, ..., 3 (la fila 100 es exactamente el amortiguamiento crítico)
+SWEEP_C_POINTS = 301
+SWEEP_C_MAX_RATIO = 3.0
+# Horizonte fijo (máximo del slider de t_max en 4.1), para que el barrido dependa solo de (m, k, A)
+SWEEP_T_MAX = 30.0
+SWEEP_T_POINTS = 1501
+# Submuestreo (filas de c, columnas de t) del mapa de calor enviado al navegador
+SWEEP_DISPLAY_STRIDE = (3, 5)
+# Banda de asentamiento relativa a la amplitud inicial (criterio del 2%)
+SETTLING_BAND = 0.02
+# Paso del campo de c en 4.1: la clasificación mostrada trata como crítico todo c a menos de medio paso de c_c,
+# ya que c_c = 2*sqrt(k*m) casi nunca es exactamente alcanzable desde el campo (CRITICAL_RTOL es solo para el solver)
+C_INPUT_STEP = 0.1
+
+# Valor en el vértice de la parábola que pasa por x[fila, i-1], x[fila, i], x[fila, i+1] (un índice por fila);
+# si la curvatura no corresponde a un extremo del tipo pedido (máximo o mínimo), devuelve la muestra sin refinar
+def parabolic_extremum(x, index, maximum=True):
+    rows = np.arange(len(x))
+    y_prev, y_mid, y_next = x[rows, index - 1], x[rows, index], x[rows, index + 1]
+    curvature = y_prev - 2 * y_mid + y_next
+    is_extremum = curvature < 0 if maximum else curvature > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(is_extremum, y_mid - (y_next - y_prev)**2 / (8 * curvature), y_mid)
+
+# Métricas de decaimiento por fila de x (forma (n_curvas, len(t))), para curvas que parten del reposo en x = A.
+# Devuelve arreglos por curva: decremento logarítmico, factor Q, tiempo de asentamiento al 2% y sobreimpulso [%]
+def decay_metrics(t, x, A):
+    # Máximos positivos interiores; cada pico se refina con una parábola por sus dos vecinos
+    inner = x[:, 1:-1]
+    peaks = (inner > x[:, :-2]) & (inner >= x[:, 2:]) & (inner > 0)
+    n_peaks = peaks.sum(axis=1)
+    last = peaks.shape[1] - np.argmax(peaks[:, ::-1], axis=1)
+    peak_value = parabolic_extremum(x, last)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # δ = ln(x_0 / x_n) / n entre el pico inicial (t = 0) y el último pico detectado
+        log_decrement = np.where(n_peaks > 0, np.log(A / peak_value) / n_peaks, np.nan)
+        # Por debajo del error del refinamiento parabólico (~1e-6) la curva se considera sin amortiguar
+        log_decrement = np.where(log_decrement < 1e-6, 0.0, log_decrement)
+        # Q = 1 / (2ζ), con ζ = δ / sqrt(4π² + δ²)
+        q_factor = np.sqrt(4 * np.pi**2 + log_decrement**2) / (2 * log_decrement)
+
+    # Asentamiento: primer instante a partir del cual |x| queda dentro de la banda (NaN si no ocurre en el horizonte)
+    outside = np.abs(x) > SETTLING_BAND * A
+    last_outside = x.shape[1] - 1 - np.argmax(outside[:, ::-1], axis=1)
+    settled = last_outside < x.shape[1] - 1
+    settling_time = np.where(settled, t[np.minimum(last_outside + 1, len(t) - 1)], np.nan)
+
+    # Sobreimpulso: máxima excursión al otro lado del equilibrio, relativa a A; el valle se refina como los picos
+    trough = np.clip(np.argmin(x, axis=1), 1, x.shape[1] - 2)
+    trough_value = np.minimum(parabolic_extremum(x, trough, maximum=False), x.min(axis=1))
+    overshoot = np.maximum(-trough_value, 0.0) / A * 100
+
+    return {
+        'log_decrement': log_decrement,
+        'q_factor': q_factor,
+        'settling_time': settling_time,
+        'overshoot': overshoot,
+    }
+
+# Simula de una vez todo el barrido de c para (m, k, A) con la solución analítica vectorizada.
+# Devuelve los valores de c, las métricas por curva y el mapa x(t, c) submuestreado para graficar
+@st.cache_data(max_entries=32, show_spinner=False)
+def damping_sweep(m, k, A):
+    c_values = 2 * np.sqrt(k * m) * np.linspace(0, SWEEP_C_MAX_RATIO, SWEEP_C_POINTS)
+    t = np.linspace(0, SWEEP_T_MAX, SWEEP_T_POINTS)
+    x, _ = damped_mas_analytic_batch([A, 0.0], t, k, m, c_values)
+    row_stride, col_stride = SWEEP_DISPLAY_STRIDE
+    return {
+        'c': c_values,
+        'metrics': decay_metrics(t, x, A),
+        'c_display': c_values[::row_stride],
+        't_display': t[::col_stride],
+        'x_display': x[::row_stride, ::col_stride],
+    }
+
+# --- Codificación Compacta de Datos de Gráficos ---
+
+# Decimales con que se envían las coordenadas sueltas de las animaciones (0.1 mm en metros)
+DISPLAY_DECIMALS = 4
+
+# Serie como float32: Plotly la envía como arreglo tipado base64 de 4 bytes por punto en lugar de 8
+def compact_series(values):
+    return np.asarray(values, dtype=np.float32)
+
+# Eje de tiempo compartido: si es uniforme se describe con (x0, dx) y ninguna traza envía su arreglo x
+def shared_time_axis(t):
+    t = np.asarray(t)
+    if len(t) > 1:
+        dx = (t[-1] - t[0]) / (len(t) - 1)
+        if np.allclose(np.diff(t), dx):
+            return dict(x=None, x0=float(t[0]), dx=float(dx))
+    return dict(x=compact_series(t))
+
+# Propiedades de una traza y(t) sobre un eje compartido, en formato compacto
+def series_trace(axis, y, **props):
+    return dict(axis, y=compact_series(y), **props)
+
+# Coordenada suelta redondeada a la precisión de despliegue
+def display_value(value):
+    return round(float(value), DISPLAY_DECIMALS)
+
+# Plantilla 'plotly_white' reducida a su layout y a los estilos de los tipos de traza que usa la app (scatter, heatmap);
+# el resto de la plantilla (surface, carpet, ...) viajaba en cada figura sin afectar lo dibujado
+@st.cache_resource
+def compact_template():
+    full = pio.templates['plotly_white']
+    return go.layout.Template(
+        layout=full.layout, data=dict(scatter=full.data.scatter, heatmap=full.data.heatmap)
+    )
+
+# --- Plantillas de Figuras (Esqueletos Persistentes) ---
+
+# Devuelve el esqueleto de la figura `name`, reconstruyéndolo solo cuando cambian sus parámetros estáticos
+def get_figure_template(name, static_key, builder):
+    templates = st.session_state.setdefault('figure_templates', {})
+    entry = templates.get(name)
+    if entry is None or entry[0] != static_key:
+        entry = (static_key, builder())
+        templates[name] = entry
+    return entry[1]
+
+# Sustituye en el sitio los datos de las trazas dinámicas (índice -> propiedades), las formas y el título
+def update_figure(fig, traces, title=None, shapes=None):
+    with fig.batch_update():
+        for i, props in traces.items():
+            fig.data[i].update(props)
+        for i, props in (shapes or {}).items():
+            fig.layout.shapes[i].update(props)
+        if title is not None:
+            fig.layout.title.text = title
+    return fig
+
+# Esqueleto de gráfico de líneas vs. tiempo (trazas vacías con su estilo)
+def build_line_figure(trace_styles, xaxis_title, yaxis_title, hovermode=None):
+    fig = go.Figure()
+    for style in trace_styles:
+        fig.add_trace(go.Scatter(mode='lines', **style))
+    fig.update_layout(
+        xaxis_title=xaxis_title,
+        yaxis_title=yaxis_title,
+        hovermode=hovermode,
+        template=compact_template()
+    )
+    return fig
+
+# Esqueleto de la animación horizontal masa-resorte: [Anclaje, Resorte, Masa]
+def build_spring_figure(range_limit, y_pos=0):
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=[-range_limit], y=[y_pos],
+        mode='markers', name='Anclaje',
+        marker=dict(size=10, color='red', symbol='square')
+    ))
+    fig.add_trace(go.Scatter(
+        x=[-range_limit, -range_limit], y=[y_pos, y_pos],
+        mode='lines', name='Resorte',
+        line=dict(color='gray', width=3, dash='dot')
+    ))
+    fig.add_trace(go.Scatter(
+        x=[-range_limit], y=[y_pos],
+        mode='markers', name='Masa',
+        marker=dict(size=30, color='#25447C', symbol='square')
+    ))
+    fig.update_layout(
+        xaxis_title='Posición X (m)',
+        yaxis_title='',
+        xaxis_range=[-range_limit, range_limit],
+        yaxis_range=[-0.5, 0.5],
+        showlegend=False,
+        template=compact_template(),
+        height=300
+    )
+    fig.update_yaxes(visible=False) # Ocultar eje Y ya que el movimiento es horizontal
+    return fig
+
+# Posición de la masa en el esqueleto masa-resorte (solo cambian Resorte y Masa)
+def spring_frame(range_limit, x_mass, y_pos=0):
+    return {
+        1: dict(x=[-range_limit, display_value(x_mass)], y=[y_pos, y_pos]),
+        2: dict(x=[display_value(x_mass)], y=[y_pos]),
+    }
+
+# Esqueleto de la animación del péndulo: [Cuerda, Masa, Trayectoria fija (opcional)]
+def build_pendulum_figure(L, x_coords=None, y_coords=None):
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=[0, 0], y=[0, -L],
+        mode='lines', name='Cuerda (L)',
+        line=dict(color='gray', width=2)
+    ))
+    fig.add_trace(go.Scatter(
+        x=[0], y=[-L],
+        mode='markers', name='Masa',
+        marker=dict(size=20, color='#25447C')
+    ))
+    if x_coords is not None:
+        fig.add_trace(go.Scatter(
+            x=compact_series(x_coords), y=compact_series(y_coords),
+            mode='lines', name='Trayectoria',
+            line=dict(color='#F89B2B', width=1, dash='dot')
+        ))
+    fig.update_layout(
+        xaxis_title='Posición X (m)',
+        yaxis_title='Posición Y (m)',
+        xaxis_range=[-L*1.1, L*1.1],
+        yaxis_range=[-L*1.1, 0.1],
+        showlegend=False,
+        template=compact_template(),
+        height=400
+    )
+    fig.update_yaxes(scaleanchor="x", scaleratio=1)
+    return fig
+
+# Posición de la masa del péndulo en su esqueleto (solo cambian Cuerda y Masa)
+def pendulum_frame(x_bob, y_bob):
+    x_bob, y_bob = display_value(x_bob), display_value(y_bob)
+    return {0: dict(x=[0, x_bob], y=[0, y_bob]), 1: dict(x=[x_bob], y=[y_bob])}
+
+# Mapa de calor x(t, c) de un barrido; formas: [c actual, c crítico]
+def build_sweep_heatmap(t, c_values, x, c_crit):
+    fig = go.Figure(go.Heatmap(
+        z=compact_series(x),
+        **shared_time_axis(t),
+        y0=float(c_values[0]), dy=float(c_values[1] - c_values[0]),
+        colorscale='RdBu', zmid=0,
+        colorbar=dict(title='x [m]')
+    ))
+    fig.update_layout(
+        xaxis_title='Tiempo (s)',
+        yaxis_title='Coeficiente de Amortiguamiento ($c$) [N·s/m]',
+        template=compact_template(),
+        height=450,
+        shapes=[
+            dict(type='line', xref='paper', x0=0, x1=1, y0=0, y1=0, line=dict(color='#000000', width=3)),
+            dict(type='line', xref='paper', x0=0, x1=1, y0=c_crit, y1=c_crit,
+                 line=dict(color='#F89B2B', width=2, dash='dash')),
+        ]
+    )
+    return fig
+
+# Métricas de un barrido vs. c: tiempo de asentamiento (eje izquierdo) y sobreimpulso (eje derecho);
+# formas: [c actual, c crítico]
+def build_sweep_metrics_figure(c_crit):
+    fig = build_line_figure(
+        [dict(name='Tiempo de asentamiento 2% [s]', line=dict(color='#25447C', width=3)),
+         dict(name='Sobreimpulso [%]', line=dict(color='#F89B2B', width=3), yaxis='y2')],
+        xaxis_title='Coeficiente de Amortiguamiento ($c$) [N·s/m]',
+        yaxis_title='Tiempo de asentamiento [s]',
+        hovermode='x unified'
+    )
+    fig.update_layout(
+        yaxis2=dict(title='Sobreimpulso [%]', overlaying='y', side='right', rangemode='tozero'),
+        shapes=[
+            dict(type='line', yref='paper', x0=0, x1=0, y0=0, y1=1, line=dict(color='#000000', width=3)),
+            dict(type='line', yref='paper', x0=c_crit, x1=c_crit, y0=0, y1=1,
+                 line=dict(color='#F89B2B', width=2, dash='dash')),
+        ]
+    )
+    return fig
+
+# --- Simulación en Tiempo Real (Paso Fijo) ---
+
+# Intervalo con que el navegador pide el siguiente lote de estados (20 cuadros/s)
+REALTIME_INTERVAL = 0.05
+# Paso máximo de RK4 y fracción de su límite de estabilidad (|λ| h ≈ 2.78) que no se supera
+REALTIME_STEP = 0.005
+RK4_STABILITY = 2.5
+# Tope de subpasos por lote y de tiempo simulado por lote si el navegador se atrasa (pestaña en segundo plano)
+REALTIME_MAX_STEPS = 400
+REALTIME_MAX_LAG = 0.25
+
+# Avanza y(t) n_steps pasos fijos de RK4 de tamaño h
+def rk4_advance(rhs, y, t, h, n_steps, args):
+    for _ in range(n_steps):
+        k1 = rhs(y, t, *args)
+        k2 = rhs(y + 0.5 * h * k1, t + 0.5 * h, *args)
+        k3 = rhs(y + 0.5 * h * k2, t + 0.5 * h, *args)
+        k4 = rhs(y + h * k3, t + h, *args)
+        y = y + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+        t = t + h
+    return y, t
+
+# Lleva el estado de la sesión (solo [y, t] y la hora del último lote) hasta el instante `now` del reloj real.
+# El paso se ajusta al radio espectral del Jacobiano para que RK4 siga siendo estable con c o k grandes; si el lote
+# necesitaría más de REALTIME_MAX_STEPS pasos, se simula menos tiempo (la animación va más lenta que el reloj)
+# en lugar de agrandar el paso por encima del límite de estabilidad.
+def advance_realtime_state(model_key, state, args, now):
+    model = OSCILLATOR_MODELS[model_key]
+    elapsed = min(now - state['wall'], REALTIME_MAX_LAG)
+    state['wall'] = now
+    if elapsed <= 0:
+        return state
+    rho = np.abs(np.linalg.eigvals(model['jac'](state['y'], state['t'], *args))).max()
+    h_max = REALTIME_STEP if rho == 0 else min(REALTIME_STEP, RK4_STABILITY / rho)
+    elapsed = min(elapsed, REALTIME_MAX_STEPS * h_max)
+    n_steps = min(int(np.ceil(elapsed / h_max)), REALTIME_MAX_STEPS)
+    state['y'], state['t'] = rk4_advance(model['rhs'], state['y'], state['t'], elapsed / n_steps, n_steps, args)
+    return state
+
+# Animación continua: el temporizador del navegador vuelve a ejecutar solo este fragmento cada REALTIME_INTERVAL,
+# y cada ejecución avanza el estado de la sesión y redibuja la figura persistente `fig`.
+# Los parámetros (`args`) se toman de la última ejecución completa, así que los cambios se aplican en vivo;
+# el estado solo se reinicia si cambia la condición inicial `y0`.
+@st.fragment(run_every=REALTIME_INTERVAL)
+def realtime_animation(name, model_key, y0, args, fig, frame, title):
+    states = st.session_state.setdefault('realtime_states', {})
+    state = states.get(name)
+    now = time.perf_counter()
+    if state is None or state['y0'] != tuple(y0):
+        state = {'y0': tuple(y0), 'y': np.array(y0, dtype=float), 't': 0.0, 'wall': now}
+        states[name] = state
+    advance_realtime_state(model_key, state, args, now)
+    update_figure(fig, frame(state['y']), title=f"{title} (t={state['t']:.2f}s)")
+    st.plotly_chart(fig, use_container_width=True)
+
+# Descarta el estado en tiempo real de `name` (la animación vuelve a su condición inicial)
+def reset_realtime_state(name):
+    st.session_state.setdefault('realtime_states', {}).pop(name, None)
+
+# --- Pre-calentamiento del Servidor ---
+
+# Importa los módulos pesados y ejecuta una vez cada modelo del registro y la serialización de figuras,
+# de modo que validadores de Plotly, plantilla 'plotly_white' y LSODA ya estén cargados
+def prewarm_runtime():
+    import_times = get_import_times()
+
+    lazy_import('scipy.integrate')
+
+    t0 = time.perf_counter()
+    t_warm = np.linspace(0, 1, 20)
+    no_cancel = threading.Event()
+    solve_ode_stepped('pendulum', [0.5, 0.0], t_warm, (9.81, 1.0), no_cancel, [0.0])
+    solve_ode_stepped('damped', [1.0, 0.0], t_warm, (10.0, 1.0, 0.5), no_cancel, [0.0])
+    solve_ode_stepped('forced', [0.0, 0.0], t_warm, (10.0, 1.0, 0.5, 5.0, 3.5), no_cancel, [0.0])
+    solve_ode_stepped('forced', [0.0, 0.0], t_warm, (10.0, 1.0, 50.0, 5.0, 3.5), no_cancel, [0.0])  # rama con Jacobiano
+    import_times.setdefault('warm: solvers ODE', time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    build_line_figure([dict(name='warm')], xaxis_title='', yaxis_title='').to_dict()
+    build_spring_figure(1.0).to_dict()
+    build_pendulum_figure(1.0, t_warm, -t_warm).to_dict()
+    build_sweep_heatmap(t_warm, t_warm, np.outer(t_warm, t_warm), 0.5).to_dict()
+    import_times.setdefault('warm: figuras Plotly', time.perf_counter() - t0)
+
+# Lanza el pre-calentamiento en segundo plano una sola vez por proceso (en la primera ejecución del script)
+@st.cache_resource
+def start_prewarm():
+    thread = threading.Thread(target=prewarm_runtime, name="mas-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+# Abre una sesión real contra un servidor ya lanzado con `streamlit run appMAS.py`, de modo que la primera
+# ejecución del script (y con ella start_prewarm()) ocurra en ese servidor antes de que llegue el primer usuario.
+# Usa el protocolo del navegador de Streamlit (websocket + protobuf), que no es API pública y puede cambiar.
+def warm_server(url, timeout=120.0):
+    import asyncio
+    import urllib.request
+    from urllib.parse import urlsplit
+    from websockets.asyncio.client import connect
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+    base = url.rstrip('/')
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            urllib.request.urlopen(f"{base}/_stcore/health", timeout=2).read()
+            break
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(1.0)
+
+    async def run_once():
+        parts = urlsplit(base)
+        scheme = 'wss' if parts.scheme == 'https' else 'ws'
+        async with connect(f"{scheme}://{parts.netloc}{parts.path}/_stcore/stream",
+                           subprotocols=["streamlit"], max_size=None) as ws:
+            rerun = BackMsg()
+            rerun.rerun_script.query_string = ""
+            await ws.send(rerun.SerializeToString())
+            while True:
+                msg = ForwardMsg()
+                msg.ParseFromString(await asyncio.wait_for(ws.recv(), deadline - time.monotonic()))
+                if msg.WhichOneof('type') == 'script_finished':
+                    return
+
+    asyncio.run(run_once())
+
+if __name__ == "__main__":
+    # Arranque del contenedor, junto al servidor: python appMAS.py --prewarm [http://localhost:8501]
+    if "--prewarm" in sys.argv[1:]:
+        urls = [arg for arg in sys.argv[1:] if arg.startswith("http")]
+        t0 = time.perf_counter()
+        warm_server(urls[0] if urls else "http://localhost:8501")
+        print(f"Servidor pre-calentado ({(time.perf_counter() - t0) * 1000:.0f} ms)")
+        sys.exit(0)
+    # Diagnóstico de arranque en frío de un proceso nuevo: python appMAS.py --import-times
+    if "--import-times" in sys.argv[1:]:
+        prewarm_runtime()
+        for name, seconds in get_import_times().items():
+            print(f"{name:<28}{seconds * 1000:9.1f} ms")
+        sys.exit(0)
+
+start_prewarm()
 
 # --- Configuración de la Página y Estilo de la UTA / Ingeniería Mecánica ---
 st.set_page_config(
@@ -89,9 +747,24 @@ menu_selection = st.sidebar.radio(
         "2. Simulación Péndulo Simple",
         "3. Análisis de Parámetros ($k$ y $m$)",
         "4. Casos Extendidos (Amortiguado, Forzado, Superposición)"
-    ]
+    ],
+    key="menu_selection"
 )
 
+# Resto del sidebar antes del contenido: una sección que se detiene con st.stop() no debe ocultarlo
+st.sidebar.markdown("---")
+
+# Desglose de tiempos de carga del proceso (para detectar regresiones de arranque)
+with st.sidebar.expander("⏱️ Tiempos de Carga del Servidor"):
+    import_times = list(get_import_times().items())  # copia: el hilo de pre-calentamiento puede seguir escribiendo
+    if import_times:
+        for name, seconds in import_times:
+            st.caption(f"`{name}`: {seconds * 1000:.1f} ms")
+    else:
+        st.caption("Pre-calentamiento en curso...")
+
+st.sidebar.markdown("Desarrollado por grupo el grupo E para Fisica 2")
+
 # --- Contenido Principal basado en la Selección ---
 
 # ----------------------------------------------------
@@ -118,7 +791,7 @@ if menu_selection == "1. Simulación Masa-Resorte":
     with col1:
         m = st.number_input("Masa ($m$) [kg]", value=1.0, min_value=0.01, step=0.1, format="%.2f")
     with col2:
-        k = st.number_input("Constante Elástica ($k$) [N/m]", value=10.0, min_value=0.01, step=1.0, format="%.2f")
+        k = st.number_input("Constante Elástica ($k$) [N/m]", value=10.0, min_value=0.01, step=1.0, format="%.2f", key="k_mas")
     with col3:
         A = st.number_input("Amplitud ($A$) [m]", value=0.5, min_value=0.01, step=0.05, format="%.2f")
     with col4:
@@ -145,36 +818,41 @@ if menu_selection == "1. Simulación Masa-Resorte":
     # --- Gráficas de Cinética (Posición, Velocidad, Aceleración) ---
     st.subheader("📈 Gráficos Cinemáticos vs. Tiempo")
     
-    fig_kinematics = go.Figure()
-    
-    fig_kinematics.add_trace(go.Scatter(x=t, y=x, mode='lines', name='Posición (x)', line=dict(color='#25447C', width=2)))
-    fig_kinematics.add_trace(go.Scatter(x=t, y=v, mode='lines', name='Velocidad (v)', line=dict(color='#F89B2B', width=2)))
-    fig_kinematics.add_trace(go.Scatter(x=t, y=a, mode='lines', name='Aceleración (a)', line=dict(color='#94B34A', width=2)))
-    
-    fig_kinematics.update_layout(
-        title='Cinemática del MAS',
+    fig_kinematics = get_figure_template('mas_kinematics', None, lambda: build_line_figure(
+        [
+            dict(name='Posición (x)', line=dict(color='#25447C', width=2)),
+            dict(name='Velocidad (v)', line=dict(color='#F89B2B', width=2)),
+            dict(name='Aceleración (a)', line=dict(color='#94B34A', width=2)),
+        ],
         xaxis_title='Tiempo (s)',
         yaxis_title='Magnitud (m, m/s, m/s²)',
-        hovermode="x unified",
-        template='plotly_white'
+        hovermode="x unified"
+    ))
+    time_axis = shared_time_axis(t)
+    update_figure(
+        fig_kinematics,
+        {0: series_trace(time_axis, x), 1: series_trace(time_axis, v), 2: series_trace(time_axis, a)},
+        title='Cinemática del MAS'
     )
     st.plotly_chart(fig_kinematics, use_container_width=True)
-    
+
     # --- Gráficas de Energía ---
     st.subheader("⚡ Gráfico de Energía vs. Tiempo")
-    
-    fig_energy = go.Figure()
-    
-    fig_energy.add_trace(go.Scatter(x=t, y=Ek, mode='lines', name='Energía Cinética ($E_k$)', line=dict(color='#F89B2B', width=3)))
-    fig_energy.add_trace(go.Scatter(x=t, y=Ep, mode='lines', name='Energía Potencial ($E_p$)', line=dict(color='#25447C', width=3)))
-    fig_energy.add_trace(go.Scatter(x=t, y=Et, mode='lines', name='Energía Total ($E_t$)', line=dict(color='gray', dash='dash', width=1.5)))
-    
-    fig_energy.update_layout(
-        title='Conservación de la Energía en el MAS',
+
+    fig_energy = get_figure_template('mas_energy', None, lambda: build_line_figure(
+        [
+            dict(name='Energía Cinética ($E_k$)', line=dict(color='#F89B2B', width=3)),
+            dict(name='Energía Potencial ($E_p$)', line=dict(color='#25447C', width=3)),
+            dict(name='Energía Total ($E_t$)', line=dict(color='gray', dash='dash', width=1.5)),
+        ],
         xaxis_title='Tiempo (s)',
         yaxis_title='Energía (J)',
-        hovermode="x unified",
-        template='plotly_white'
+        hovermode="x unified"
+    ))
+    update_figure(
+        fig_energy,
+        {0: series_trace(time_axis, Ek), 1: series_trace(time_axis, Ep), 2: series_trace(time_axis, Et)},
+        title='Conservación de la Energía en el MAS'
     )
     st.plotly_chart(fig_energy, use_container_width=True)
     
@@ -185,8 +863,11 @@ if menu_selection == "1. Simulación Masa-Resorte":
     def start_mas_animation():
         st.session_state.mas_run = True
 
+    # Modo continuo: el estado avanza en vivo y los cambios de parámetros se aplican sin reiniciar
+    realtime_mas = st.toggle("⏱️ Modo en Tiempo Real", key="rt_mas")
+
     # Botón de Play
-    if st.button("▶️ Iniciar Animación", key="btn_mas_start"):
+    if st.button("▶️ Iniciar Animación", key="btn_mas_start", disabled=realtime_mas):
         start_mas_animation()
 
     # Contenedor para la animación
@@ -196,53 +877,35 @@ if menu_selection == "1. Simulación Masa-Resorte":
     y_pos = 0  # Movimiento horizontal, y fijo en 0
     range_limit = A * 1.2 # Rango para el eje x, con un margen
 
+    # Esqueleto persistente: anclaje, resorte y masa (solo se reconstruye si cambia el rango)
+    fig_animation = get_figure_template('mas_spring', range_limit, lambda: build_spring_figure(range_limit, y_pos))
+
+    if realtime_mas:
+        st.markdown("Simulación continua en tiempo real. Los cambios de $m$ y $k$ se aplican en vivo; cambiar $A$ la reinicia.")
+        if st.button("🔄 Reiniciar", key="btn_mas_reset"):
+            reset_realtime_state('mas')
+        # MAS sin amortiguamiento: modelo 'damped' con c = 0
+        realtime_animation(
+            'mas', 'damped', [A, 0.0], (k, m, 0.0), fig_animation,
+            lambda y: spring_frame(range_limit, y[0], y_pos), "Posición Física de la Masa"
+        )
+
     # Solo ejecutar el bucle si el estado es True
-    if st.session_state.mas_run:
+    elif st.session_state.mas_run:
 
         st.markdown("Animación en curso. Ajusta los parámetros y vuelve a presionar el botón para reiniciar.")
 
         # Reducir el número de puntos para una animación más fluida
-        t_anim = np.linspace(0, T_max, 50) 
+        t_anim = np.linspace(0, T_max, 50)
         x_anim = A * np.cos(omega * t_anim) # Posición de la masa (x(t))
 
         for i in range(len(t_anim)):
 
-            # Crear la figura Plotly para la representación física
-            fig_animation = go.Figure()
-
-            # 1. Punto de Anclaje Fijo (La pared)
-            fig_animation.add_trace(go.Scatter(
-                x=[-range_limit], y=[y_pos],
-                mode='markers', name='Anclaje', 
-                marker=dict(size=10, color='red', symbol='square')
-            ))
-            
-            # 2. Resorte (Línea simple del anclaje a la masa)
-            fig_animation.add_trace(go.Scatter(
-                x=[-range_limit, x_anim[i]], y=[y_pos, y_pos],
-                mode='lines', name='Resorte', 
-                line=dict(color='gray', width=3, dash='dot')
-            ))
-
-            # 3. Traza de la Masa (Punto azul grande)
-            fig_animation.add_trace(go.Scatter(
-                x=[x_anim[i]], y=[y_pos],
-                mode='markers', name='Masa', 
-                marker=dict(size=30, color='#25447C', symbol='square')
-            ))
-
-            # Configuración del layout
-            fig_animation.update_layout(
-                title=f"Posición Física de la Masa (t={t_anim[i]:.2f}s)",
-                xaxis_title='Posición X (m)',
-                yaxis_title='',
-                xaxis_range=[-range_limit, range_limit],
-                yaxis_range=[-0.5, 0.5], 
-                showlegend=False,
-                template='plotly_white',
-                height=300
+            # Solo se actualizan el resorte, la masa y el título
+            update_figure(
+                fig_animation, spring_frame(range_limit, x_anim[i], y_pos),
+                title=f"Posición Física de la Masa (t={t_anim[i]:.2f}s)"
             )
-            fig_animation.update_yaxes(visible=False) # Ocultar eje Y ya que el movimiento es horizontal
 
             animation_placeholder.plotly_chart(fig_animation, use_container_width=True)
 
@@ -258,23 +921,8 @@ if menu_selection == "1. Simulación Masa-Resorte":
         st.markdown("Presione **'Iniciar Animación'** para visualizar el movimiento horizontal.")
 
         # Posición inicial (x[0] = A, ya que phi=0)
-        fig_initial = go.Figure()
-        fig_initial.add_trace(go.Scatter(x=[-range_limit], y=[y_pos], mode='markers', marker=dict(size=10, color='red', symbol='square')))
-        fig_initial.add_trace(go.Scatter(x=[-range_limit, x[0]], y=[y_pos, y_pos], mode='lines', line=dict(color='gray', width=3, dash='dot')))
-        fig_initial.add_trace(go.Scatter(x=[x[0]], y=[y_pos], mode='markers', marker=dict(size=30, color='#25447C', symbol='square')))
-
-        fig_initial.update_layout(
-            title="Posición Inicial de la Masa",
-            xaxis_title='Posición X (m)',
-            yaxis_title='',
-            xaxis_range=[-range_limit, range_limit],
-            yaxis_range=[-0.5, 0.5], 
-            showlegend=False,
-            template='plotly_white',
-            height=300
-        )
-        fig_initial.update_yaxes(visible=False)
-        animation_placeholder.plotly_chart(fig_initial, use_container_width=True)
+        update_figure(fig_animation, spring_frame(range_limit, x[0], y_pos), title="Posición Inicial de la Masa")
+        animation_placeholder.plotly_chart(fig_animation, use_container_width=True)
     
 # ----------------------------------------------------
 # 2. Simulación Péndulo Simple
@@ -296,7 +944,7 @@ elif menu_selection == "2. Simulación Péndulo Simple":
     with col2:
         g = st.number_input("Aceleración de Gravedad ($g$) [m/s²]", value=9.81, min_value=0.1, step=0.1, format="%.2f")
     with col3:
-        theta_0_deg = st.number_input("Ángulo Inicial ($\Theta_0$) [grados]", value=30.0, min_value=0.1, max_value=179.0, step=5.0, format="%.2f")
+        theta_0_deg = st.number_input("Ángulo Inicial ($\Theta_0$) [grados]", value=30.0, min_value=0.1, max_value=179.0, step=5.0, format="%.2f", key="theta_0_deg")
     
     T_max = st.slider("Tiempo Máximo de Simulación ($t_{max}$) [s]", 5.0, 30.0, 15.0, 1.0)
     
@@ -310,7 +958,7 @@ elif menu_selection == "2. Simulación Péndulo Simple":
     theta_lin = theta_0 * np.cos(omega_lin * t)
     
     y0 = [theta_0, 0.0]  # [Ángulo inicial, Velocidad angular inicial]
-    sol = odeint(pendulum_ode, y0, t, args=(g, L))
+    sol, stats = run_solver_job('pendulum', 'pendulum', y0, t, (g, L))
     theta_nonlin = sol[:, 0]
     
     st.markdown(f"***Periodo Lineal ($T$):*** **{T_lin:.2f} s**")
@@ -318,26 +966,33 @@ elif menu_selection == "2. Simulación Péndulo Simple":
     # --- Gráfica de Ángulo vs. Tiempo (Simulación Gráfica) ---
     st.subheader("📊 Comparación: Modelo Lineal vs. No Lineal")
     
-    fig_pendulum = go.Figure()
-    
-    fig_pendulum.add_trace(go.Scatter(x=t, y=np.rad2deg(theta_nonlin), mode='lines', name='Modelo No Lineal (Real)', line=dict(color='#25447C', width=3)))
-    fig_pendulum.add_trace(go.Scatter(x=t, y=np.rad2deg(theta_lin), mode='lines', name='Modelo Lineal (MAS)', line=dict(color='#F89B2B', dash='dash', width=2)))
-    
-    fig_pendulum.update_layout(
-        title=f'Ángulo ($\Theta$) vs. Tiempo para Péndulo Simple ($\Theta_0 = {theta_0_deg}^\circ$)',
+    time_axis = shared_time_axis(t)
+    fig_pendulum = get_figure_template('pendulum_angle', None, lambda: build_line_figure(
+        [
+            dict(name='Modelo No Lineal (Real)', line=dict(color='#25447C', width=3)),
+            dict(name='Modelo Lineal (MAS)', line=dict(color='#F89B2B', dash='dash', width=2)),
+        ],
         xaxis_title='Tiempo (s)',
         yaxis_title='Ángulo ($\Theta$) [grados]',
-        hovermode="x unified",
-        template='plotly_white'
+        hovermode="x unified"
+    ))
+    update_figure(
+        fig_pendulum,
+        {0: series_trace(time_axis, np.rad2deg(theta_nonlin)), 1: series_trace(time_axis, np.rad2deg(theta_lin))},
+        title=f'Ángulo ($\Theta$) vs. Tiempo para Péndulo Simple ($\Theta_0 = {theta_0_deg}^\circ$)'
     )
     st.plotly_chart(fig_pendulum, use_container_width=True)
+    st.caption(format_solver_stats(stats))
     
     # --- Sección de Animación Visual ---
     
     st.subheader("🎬 Animación Visual del Péndulo Simple")
 
+    # Modo continuo: el estado avanza en vivo y los cambios de parámetros se aplican sin reiniciar
+    realtime_pendulum = st.toggle("⏱️ Modo en Tiempo Real", key="rt_pendulum")
+
     # Botón de Play
-    if st.button("▶️ Iniciar Animación", key="btn_pendulum_start"):
+    if st.button("▶️ Iniciar Animación", key="btn_pendulum_start", disabled=realtime_pendulum):
         start_pendulum_animation()
     
     # 1. Calcular coordenadas cartesianas (X, Y)
@@ -346,55 +1001,41 @@ elif menu_selection == "2. Simulación Péndulo Simple":
 
     # Contenedor para la animación
     animation_placeholder = st.empty()
-    
+
+    # Esqueleto persistente con la trayectoria completa (solo se reconstruye si cambian los parámetros)
+    fig_animation = get_figure_template(
+        'pendulum_animation', (L, g, theta_0_deg, T_max),
+        lambda: build_pendulum_figure(L, x_coords, y_coords)
+    )
+
+    if realtime_pendulum:
+        st.markdown("Simulación continua en tiempo real (modelo no lineal). Los cambios de $L$ y $g$ se aplican en vivo; cambiar $\\Theta_0$ la reinicia.")
+        if st.button("🔄 Reiniciar", key="btn_pendulum_reset"):
+            reset_realtime_state('pendulum')
+        # Esqueleto sin la trayectoria precalculada: cada tic reenvía la figura completa y esa traza es estática
+        fig_realtime = get_figure_template('pendulum_realtime', L, lambda: build_pendulum_figure(L))
+        realtime_animation(
+            'pendulum', 'pendulum', [theta_0, 0.0], (g, L), fig_realtime,
+            lambda y: pendulum_frame(L * np.sin(y[0]), -L * np.cos(y[0])), "Posición Física del Péndulo"
+        )
+
     # Solo ejecutar el bucle si el estado es True (el botón fue presionado)
-    if st.session_state.pendulum_run:
-        
+    elif st.session_state.pendulum_run:
+
         st.markdown("Animación en curso. Ajusta los parámetros y vuelve a presionar el botón para reiniciar.")
-        
+
         # Reducir el número de puntos para una animación más fluida
-        t_anim = np.linspace(0, T_max, 50) 
+        t_anim = np.linspace(0, T_max, 50)
         x_anim = np.interp(t_anim, t, x_coords)
         y_anim = np.interp(t_anim, t, y_coords)
 
         for i in range(len(t_anim)):
-            
-            # Crear la figura Plotly para la representación física
-            fig_animation = go.Figure()
-            
-            # 1. Traza de la Cuerda (Línea desde el origen hasta la masa)
-            fig_animation.add_trace(go.Scatter(
-                x=[0, x_anim[i]], y=[0, y_anim[i]],
-                mode='lines', name='Cuerda (L)', 
-                line=dict(color='gray', width=2)
-            ))
-            
-            # 2. Traza de la Masa (Punto)
-            fig_animation.add_trace(go.Scatter(
-                x=[x_anim[i]], y=[y_anim[i]],
-                mode='markers', name='Masa', 
-                marker=dict(size=20, color='#25447C')
-            ))
-            
-            # 3. Trayectoria (Para contexto visual)
-            fig_animation.add_trace(go.Scatter(
-                x=x_coords, y=y_coords,
-                mode='lines', name='Trayectoria', 
-                line=dict(color='#F89B2B', width=1, dash='dot')
-            ))
-            
-            # Configuración del layout
-            fig_animation.update_layout(
-                title=f"Posición Física del Péndulo (t={t_anim[i]:.2f}s)",
-                xaxis_title='Posición X (m)',
-                yaxis_title='Posición Y (m)',
-                xaxis_range=[-L*1.1, L*1.1],
-                yaxis_range=[-L*1.1, 0.1], 
-                showlegend=False,
-                template='plotly_white',
-                height=400
+
+            # Solo se actualizan la cuerda, la masa y el título
+            update_figure(
+                fig_animation, pendulum_frame(x_anim[i], y_anim[i]),
+                title=f"Posición Física del Péndulo (t={t_anim[i]:.2f}s)"
             )
-            fig_animation.update_yaxes(scaleanchor="x", scaleratio=1) 
 
             animation_placeholder.plotly_chart(fig_animation, use_container_width=True)
             
@@ -409,18 +1050,8 @@ elif menu_selection == "2. Simulación Péndulo Simple":
         # Mostramos la posición inicial cuando no está corriendo
         st.markdown("Presione **'Iniciar Animación'** para visualizar el movimiento.")
         
-        fig_initial = go.Figure()
-        fig_initial.add_trace(go.Scatter(x=[0, x_coords[0]], y=[0, y_coords[0]], mode='lines', line=dict(color='gray', width=2)))
-        fig_initial.add_trace(go.Scatter(x=[x_coords[0]], y=[y_coords[0]], mode='markers', marker=dict(size=20, color='#25447C')))
-        fig_initial.add_trace(go.Scatter(x=x_coords, y=y_coords, mode='lines', line=dict(color='#F89B2B', width=1, dash='dot')))
-        fig_initial.update_layout(
-            title="Posición Inicial del Péndulo",
-            xaxis_title='Posición X (m)', yaxis_title='Posición Y (m)',
-            xaxis_range=[-L*1.1, L*1.1], yaxis_range=[-L*1.1, 0.1], 
-            showlegend=False, template='plotly_white', height=400
-        )
-        fig_initial.update_yaxes(scaleanchor="x", scaleratio=1)
-        animation_placeholder.plotly_chart(fig_initial, use_container_width=True)
+        update_figure(fig_animation, pendulum_frame(x_coords[0], y_coords[0]), title="Posición Inicial del Péndulo")
+        animation_placeholder.plotly_chart(fig_animation, use_container_width=True)
 
 
     st.subheader("💡 Explicación Física")
@@ -460,14 +1091,14 @@ elif menu_selection == "3. Análisis de Parámetros ($k$ y $m$)":
     # --- Gráfico 1: T vs. k (m constante) ---
     T_vs_k = 2 * np.pi * np.sqrt(m_fixed / k_array)
     
-    fig_k = go.Figure(data=[
-        go.Scatter(x=k_array, y=T_vs_k, mode='lines', line=dict(color='#25447C', width=3))
-    ])
-    fig_k.update_layout(
-        title=f'Periodo ($T$) vs. Constante Elástica ($k$) (Masa $m={m_fixed}$ kg)',
+    fig_k = get_figure_template('period_vs_k', None, lambda: build_line_figure(
+        [dict(line=dict(color='#25447C', width=3))],
         xaxis_title='Constante Elástica ($k$) [N/m]',
-        yaxis_title='Periodo ($T$) [s]',
-        template='plotly_white'
+        yaxis_title='Periodo ($T$) [s]'
+    ))
+    update_figure(
+        fig_k, {0: series_trace(shared_time_axis(k_array), T_vs_k)},
+        title=f'Periodo ($T$) vs. Constante Elástica ($k$) (Masa $m={m_fixed}$ kg)'
     )
     st.plotly_chart(fig_k, use_container_width=True)
     st.markdown("El gráfico muestra una **relación inversa no lineal ($\propto 1/\sqrt{k}$)**. Un resorte más rígido ($k$ alto) da un periodo más corto.")
@@ -475,14 +1106,14 @@ elif menu_selection == "3. Análisis de Parámetros ($k$ y $m$)":
     # --- Gráfico 2: T vs. m (k constante) ---
     T_vs_m = 2 * np.pi * np.sqrt(m_array / k_fixed)
     
-    fig_m = go.Figure(data=[
-        go.Scatter(x=m_array, y=T_vs_m, mode='lines', line=dict(color='#F89B2B', width=3))
-    ])
-    fig_m.update_layout(
-        title=f'Periodo ($T$) vs. Masa ($m$) (Constante $k={k_fixed}$ N/m)',
+    fig_m = get_figure_template('period_vs_m', None, lambda: build_line_figure(
+        [dict(line=dict(color='#F89B2B', width=3))],
         xaxis_title='Masa ($m$) [kg]',
-        yaxis_title='Periodo ($T$) [s]',
-        template='plotly_white'
+        yaxis_title='Periodo ($T$) [s]'
+    ))
+    update_figure(
+        fig_m, {0: series_trace(shared_time_axis(m_array), T_vs_m)},
+        title=f'Periodo ($T$) vs. Masa ($m$) (Constante $k={k_fixed}$ N/m)'
     )
     st.plotly_chart(fig_m, use_container_width=True)
     st.markdown("El gráfico muestra una **relación directa no lineal ($\propto \sqrt{m}$)**. Una masa mayor ($m$ alto) da un periodo más largo.")
@@ -497,7 +1128,8 @@ elif menu_selection == "4. Casos Extendidos (Amortiguado, Forzado, Superposició
     
     extended_case = st.selectbox(
         "Seleccione el caso avanzado:",
-        ["MAS con Amortiguamiento", "MAS Forzado", "Superposición de Oscilaciones"]
+        ["MAS con Amortiguamiento", "MAS Forzado", "Superposición de Oscilaciones"],
+        key="extended_case"
     )
     
     st.markdown("---")
@@ -520,7 +1152,7 @@ elif menu_selection == "4. Casos Extendidos (Amortiguado, Forzado, Superposició
         with col2:
             k_d = st.number_input("Constante Elástica ($k$) [N/m] | Amort.", value=10.0, min_value=1.0, step=1.0, key="k_d")
         with col3:
-            c_d = st.number_input("Coeficiente de Amortiguamiento ($c$) [N·s/m]", value=0.5, min_value=0.0, step=0.1, key="c_d")
+            c_d = st.number_input("Coeficiente de Amortiguamiento ($c$) [N·s/m]", value=0.5, min_value=0.0, step=C_INPUT_STEP, key="c_d")
 
         T_max_d = st.slider("Tiempo Máximo de Simulación ($t_{max}$) [s] | Amort.", 5.0, 30.0, 20.0, 1.0)
         A_d = st.number_input("Amplitud Inicial ($A_0$) [m] | Amort.", value=1.0, min_value=0.1, step=0.1, key="A_d")
@@ -528,7 +1160,7 @@ elif menu_selection == "4. Casos Extendidos (Amortiguado, Forzado, Superposició
         # Simulación
         t_d = np.linspace(0, T_max_d, 500)
         y0_d = [A_d, 0.0]  # [Posición inicial, Velocidad inicial]
-        sol_d = odeint(damped_mas_ode, y0_d, t_d, args=(k_d, m_d, c_d))
+        sol_d, stats_d = run_solver_job('damped', 'damped', y0_d, t_d, (k_d, m_d, c_d))
         x_d = sol_d[:, 0]
         
         # Parámetro crítico (para c_c=2*sqrt(km))
@@ -536,16 +1168,17 @@ elif menu_selection == "4. Casos Extendidos (Amortiguado, Forzado, Superposició
         
         # --- Gráfico de Posición vs. Tiempo ---
         st.subheader("📈 Gráfico de Posición vs. Tiempo")
-        fig_damped = go.Figure(data=[
-            go.Scatter(x=t_d, y=x_d, mode='lines', name=f'Oscilación (c={c_d} N·s/m)', line=dict(color='#25447C', width=3))
-        ])
-        fig_damped.update_layout(
-            title=f'MAS Amortiguado (c_crítico = {c_critico:.2f} N·s/m)',
+        fig_damped = get_figure_template('damped_position', None, lambda: build_line_figure(
+            [dict(line=dict(color='#25447C', width=3))],
             xaxis_title='Tiempo (s)',
-            yaxis_title='Posición (x) [m]',
-            template='plotly_white'
+            yaxis_title='Posición (x) [m]'
+        ))
+        update_figure(
+            fig_damped, {0: series_trace(shared_time_axis(t_d), x_d, name=f'Oscilación (c={c_d} N·s/m)')},
+            title=f'MAS Amortiguado (c_crítico = {c_critico:.2f} N·s/m)'
         )
         st.plotly_chart(fig_damped, use_container_width=True)
+        st.caption(format_solver_stats(stats_d))
 
         # --- Animación Visual Amortiguada ---
         st.subheader("🎬 Animación Visual Amortiguada")
@@ -553,13 +1186,25 @@ elif menu_selection == "4. Casos Extendidos (Amortiguado, Forzado, Superposició
         def start_damped_animation():
             st.session_state.damped_run = True
 
-        if st.button("▶️ Iniciar Animación Amortiguada", key="btn_damped_start"):
+        realtime_damped = st.toggle("⏱️ Modo en Tiempo Real", key="rt_damped")
+
+        if st.button("▶️ Iniciar Animación Amortiguada", key="btn_damped_start", disabled=realtime_damped):
             start_damped_animation()
 
         damped_placeholder = st.empty()
         range_limit = A_d * 1.2 # Rango basado en la amplitud inicial
+        fig_animation = get_figure_template('damped_spring', range_limit, lambda: build_spring_figure(range_limit, y_pos))
 
-        if st.session_state.damped_run:
+        if realtime_damped:
+            st.markdown("Simulación continua en tiempo real. Los cambios de $m$, $k$ y $c$ se aplican en vivo; cambiar $A_0$ la reinicia.")
+            if st.button("🔄 Reiniciar", key="btn_damped_reset"):
+                reset_realtime_state('damped')
+            realtime_animation(
+                'damped', 'damped', y0_d, (k_d, m_d, c_d), fig_animation,
+                lambda y: spring_frame(range_limit, y[0], y_pos), "MAS Amortiguado"
+            )
+
+        elif st.session_state.damped_run:
             st.markdown("Animación en curso. La amplitud disminuye con el tiempo.")
             
             # Puntos de la solución ODE para animación (reducidos a 50 puntos)
@@ -567,30 +1212,10 @@ elif menu_selection == "4. Casos Extendidos (Amortiguado, Forzado, Superposició
             x_anim_d = np.interp(t_anim_d, t_d, x_d)
             
             for i in range(len(t_anim_d)):
-                fig_animation = go.Figure()
-
-                # Anclaje
-                fig_animation.add_trace(go.Scatter(
-                    x=[-range_limit], y=[y_pos], mode='markers', marker=dict(size=10, color='red', symbol='square')
-                ))
-                # Resorte
-                fig_animation.add_trace(go.Scatter(
-                    x=[-range_limit, x_anim_d[i]], y=[y_pos, y_pos],
-                    mode='lines', line=dict(color='gray', width=3, dash='dot')
-                ))
-                # Masa
-                fig_animation.add_trace(go.Scatter(
-                    x=[x_anim_d[i]], y=[y_pos],
-                    mode='markers', marker=dict(size=30, color='#25447C', symbol='square')
-                ))
-
-                fig_animation.update_layout(
-                    title=f"MAS Amortiguado (t={t_anim_d[i]:.2f}s)",
-                    xaxis_title='Posición X (m)', yaxis_title='',
-                    xaxis_range=[-range_limit, range_limit], yaxis_range=[-0.5, 0.5], 
-                    showlegend=False, template='plotly_white', height=300
+                update_figure(
+                    fig_animation, spring_frame(range_limit, x_anim_d[i], y_pos),
+                    title=f"MAS Amortiguado (t={t_anim_d[i]:.2f}s)"
                 )
-                fig_animation.update_yaxes(visible=False) 
                 damped_placeholder.plotly_chart(fig_animation, use_container_width=True)
                 time.sleep(0.05) 
                 
@@ -600,27 +1225,74 @@ elif menu_selection == "4. Casos Extendidos (Amortiguado, Forzado, Superposició
         else:
             # Posición inicial estática
             x_initial = x_d[0]
-            fig_initial = go.Figure()
-            fig_initial.add_trace(go.Scatter(x=[-range_limit], y=[y_pos], mode='markers', marker=dict(size=10, color='red', symbol='square')))
-            fig_initial.add_trace(go.Scatter(x=[-range_limit, x_initial], y=[y_pos, y_pos], mode='lines', line=dict(color='gray', width=3, dash='dot')))
-            fig_initial.add_trace(go.Scatter(x=[x_initial], y=[y_pos], mode='markers', marker=dict(size=30, color='#25447C', symbol='square')))
-
-            fig_initial.update_layout(
-                title="Posición Inicial (Amortiguado)", xaxis_title='Posición X (m)', yaxis_title='',
-                xaxis_range=[-range_limit, range_limit], yaxis_range=[-0.5, 0.5], showlegend=False, template='plotly_white', height=300
-            )
-            fig_initial.update_yaxes(visible=False)
-            damped_placeholder.plotly_chart(fig_initial, use_container_width=True)
+            update_figure(fig_animation, spring_frame(range_limit, x_initial, y_pos), title="Posición Inicial (Amortiguado)")
+            damped_placeholder.plotly_chart(fig_animation, use_container_width=True)
         
         st.subheader("💡 Clasificación del Movimiento")
         if c_d == 0:
             st.markdown("* **MAS no Amortiguado** (Oscilación persistente)")
+        elif abs(c_d - c_critico) <= C_INPUT_STEP / 2:
+            st.markdown(f"* **Amortiguamiento Crítico:** El sistema vuelve al equilibrio **más rápido** sin oscilar "
+                        f"($c$ está a menos de {C_INPUT_STEP / 2:g} N·s/m de $c_{{crítico}}$ = {c_critico:.2f} N·s/m).")
         elif c_d < c_critico:
             st.markdown("* **Subamortiguado:** El sistema **oscila** con amplitud decreciente (la curva azul).")
-        elif c_d == c_critico:
-            st.markdown("* **Amortiguamiento Crítico:** El sistema vuelve al equilibrio **más rápido** sin oscilar.")
         else: # c_d > c_critico
             st.markdown("* **Sobreamortiguado:** El sistema vuelve al equilibrio **lentamente** sin oscilar.")
+
+        # --- Explorador de Regímenes de Amortiguamiento ---
+        st.subheader("🔭 Explorador de Regímenes de Amortiguamiento")
+        st.markdown(
+            f"Se simulan de una vez **{SWEEP_C_POINTS} valores de $c$** entre 0 y "
+            f"${SWEEP_C_MAX_RATIO:g} \\cdot c_{{crítico}}$ con la misma masa, rigidez y amplitud. "
+            "La línea negra marca el $c$ actual y la naranja discontinua el amortiguamiento crítico."
+        )
+        sweep = damping_sweep(m_d, k_d, A_d)
+        sweep_metrics = sweep['metrics']
+
+        # Mapa de calor x(t, c), recortado al t_max elegido
+        n_cols = np.searchsorted(sweep['t_display'], T_max_d, side='right')
+        fig_sweep = get_figure_template(
+            'damping_sweep', (m_d, k_d, A_d, T_max_d),
+            lambda: build_sweep_heatmap(
+                sweep['t_display'][:n_cols], sweep['c_display'], sweep['x_display'][:, :n_cols], c_critico
+            )
+        )
+        update_figure(fig_sweep, {}, title='Posición x(t, c) a lo largo del Barrido', shapes={0: dict(y0=c_d, y1=c_d)})
+        st.plotly_chart(fig_sweep, use_container_width=True)
+
+        # Métricas de decaimiento vs. c
+        fig_sweep_metrics = get_figure_template(
+            'damping_sweep_metrics', c_critico, lambda: build_sweep_metrics_figure(c_critico)
+        )
+        c_axis = shared_time_axis(sweep['c'])
+        update_figure(
+            fig_sweep_metrics,
+            {0: series_trace(c_axis, sweep_metrics['settling_time']), 1: series_trace(c_axis, sweep_metrics['overshoot'])},
+            title='Asentamiento (2%) y Sobreimpulso vs. $c$',
+            shapes={0: dict(x0=c_d, x1=c_d)}
+        )
+        st.plotly_chart(fig_sweep_metrics, use_container_width=True)
+
+        # Métricas del c actual, sobre el mismo horizonte que el barrido
+        t_sweep = np.linspace(0, SWEEP_T_MAX, SWEEP_T_POINTS)
+        x_current, _ = damped_mas_analytic_batch([A_d, 0.0], t_sweep, k_d, m_d, [c_d])
+        current = {name: values[0] for name, values in decay_metrics(t_sweep, x_current, A_d).items()}
+
+        # Decimales fijos: el ruido de punto flotante (p. ej. un sobreimpulso de 1e-14 %) se muestra como 0
+        def format_metric(value, decimals, unit=''):
+            if np.isnan(value):
+                return "—"
+            return "∞" if np.isinf(value) else f"{value + 0.0:.{decimals}f}{unit}"
+
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Decremento Logarítmico (δ)", format_metric(current['log_decrement'], 3))
+        col2.metric("Factor de Calidad (Q)", format_metric(current['q_factor'], 2))
+        col3.metric("Asentamiento 2% ($t_s$)", format_metric(current['settling_time'], 2, ' s'))
+        col4.metric("Sobreimpulso", format_metric(current['overshoot'], 2, ' %'))
+        st.caption(
+            f"δ y Q se miden entre picos sucesivos (— si la curva no oscila); $t_s$ es — si no se asienta "
+            f"antes de {SWEEP_T_MAX:g} s. El sobreimpulso es la excursión máxima al otro lado del equilibrio."
+        )
             
     # ----------------------------------------------------
     # 4.2. MAS Forzado
@@ -641,7 +1313,8 @@ elif menu_selection == "4. Casos Extendidos (Amortiguado, Forzado, Superposició
         with col4:
             F0 = st.number_input("Amplitud de Fuerza ($F_0$) [N]", value=5.0, min_value=0.1, step=1.0, key="F0")
         with col5:
-            w_f = st.number_input("Frecuencia de Fuerza ($\omega_f$) [rad/s]", value=3.5, min_value=0.1, step=0.1, key="w_f")
+            # Con 1000 puntos en hasta 50 s, frecuencias mucho mayores no se podrían ni dibujar sin aliasing
+            w_f = st.number_input("Frecuencia de Fuerza ($\omega_f$) [rad/s]", value=3.5, min_value=0.1, max_value=200.0, step=0.1, key="w_f")
 
         T_max_f = st.slider("Tiempo Máximo de Simulación ($t_{max}$) [s] | Forzado", 5.0, 50.0, 30.0, 1.0)
         
@@ -654,7 +1327,7 @@ elif menu_selection == "4. Casos Extendidos (Amortiguado, Forzado, Superposició
         # Simulación
         t_f = np.linspace(0, T_max_f, 1000)
         y0_f = [0.0, 0.0]  # [Posición inicial, Velocidad inicial]
-        sol_f = odeint(forced_mas_ode, y0_f, t_f, args=(k_f, m_f, c_f, F0, w_f))
+        sol_f, stats_f = run_solver_job('forced', 'forced', y0_f, t_f, (k_f, m_f, c_f, F0, w_f))
         x_f = sol_f[:, 0]
         
         
@@ -665,16 +1338,17 @@ elif menu_selection == "4. Casos Extendidos (Amortiguado, Forzado, Superposició
         if omega_n == 0.0:
             title_forced = 'MAS Forzado (Frecuencia Natural no definida/cero)'
             
-        fig_forced = go.Figure(data=[
-            go.Scatter(x=t_f, y=x_f, mode='lines', name=f'Posición (w_f={w_f} rad/s)', line=dict(color='#F89B2B', width=2))
-        ])
-        fig_forced.update_layout(
-            title=title_forced,
+        fig_forced = get_figure_template('forced_position', None, lambda: build_line_figure(
+            [dict(line=dict(color='#F89B2B', width=2))],
             xaxis_title='Tiempo (s)',
-            yaxis_title='Posición (x) [m]',
-            template='plotly_white'
+            yaxis_title='Posición (x) [m]'
+        ))
+        update_figure(
+            fig_forced, {0: series_trace(shared_time_axis(t_f), x_f, name=f'Posición (w_f={w_f} rad/s)')},
+            title=title_forced
         )
         st.plotly_chart(fig_forced, use_container_width=True)
+        st.caption(format_solver_stats(stats_f))
 
         # --- Animación Visual Forzada ---
 
@@ -683,7 +1357,9 @@ elif menu_selection == "4. Casos Extendidos (Amortiguado, Forzado, Superposició
         def start_forced_animation():
             st.session_state.forced_run = True
 
-        if st.button("▶️ Iniciar Animación Forzada", key="btn_forced_start"):
+        realtime_forced = st.toggle("⏱️ Modo en Tiempo Real", key="rt_forced")
+
+        if st.button("▶️ Iniciar Animación Forzada", key="btn_forced_start", disabled=realtime_forced):
             start_forced_animation()
 
         forced_placeholder = st.empty()
@@ -691,8 +1367,18 @@ elif menu_selection == "4. Casos Extendidos (Amortiguado, Forzado, Superposició
         # Calcular la amplitud máxima alcanzada para el rango de la visualización
         A_max = np.max(np.abs(x_f))
         range_limit_f = A_max * 1.2
+        fig_animation = get_figure_template('forced_spring', range_limit_f, lambda: build_spring_figure(range_limit_f, y_pos))
         
-        if st.session_state.forced_run:
+        if realtime_forced:
+            st.markdown("Simulación continua en tiempo real. Los cambios de $m$, $k$, $c$, $F_0$ y $\\omega_f$ se aplican en vivo.")
+            if st.button("🔄 Reiniciar", key="btn_forced_reset"):
+                reset_realtime_state('forced')
+            realtime_animation(
+                'forced', 'forced', y0_f, (k_f, m_f, c_f, F0, w_f), fig_animation,
+                lambda y: spring_frame(range_limit_f, y[0], y_pos), "MAS Forzado"
+            )
+
+        elif st.session_state.forced_run:
             st.markdown("Animación en curso. La masa se estabiliza oscilando a la frecuencia forzada.")
             
             # Puntos de la solución ODE para animación (reducidos a 100 puntos)
@@ -700,30 +1386,10 @@ elif menu_selection == "4. Casos Extendidos (Amortiguado, Forzado, Superposició
             x_anim_f = np.interp(t_anim_f, t_f, x_f)
             
             for i in range(len(t_anim_f)):
-                fig_animation = go.Figure()
-
-                # Anclaje
-                fig_animation.add_trace(go.Scatter(
-                    x=[-range_limit_f], y=[y_pos], mode='markers', marker=dict(size=10, color='red', symbol='square')
-                ))
-                # Resorte
-                fig_animation.add_trace(go.Scatter(
-                    x=[-range_limit_f, x_anim_f[i]], y=[y_pos, y_pos],
-                    mode='lines', line=dict(color='gray', width=3, dash='dot')
-                ))
-                # Masa
-                fig_animation.add_trace(go.Scatter(
-                    x=[x_anim_f[i]], y=[y_pos],
-                    mode='markers', marker=dict(size=30, color='#25447C', symbol='square')
-                ))
-
-                fig_animation.update_layout(
-                    title=f"MAS Forzado (t={t_anim_f[i]:.2f}s)",
-                    xaxis_title='Posición X (m)', yaxis_title='',
-                    xaxis_range=[-range_limit_f, range_limit_f], yaxis_range=[-0.5, 0.5], 
-                    showlegend=False, template='plotly_white', height=300
+                update_figure(
+                    fig_animation, spring_frame(range_limit_f, x_anim_f[i], y_pos),
+                    title=f"MAS Forzado (t={t_anim_f[i]:.2f}s)"
                 )
-                fig_animation.update_yaxes(visible=False) 
                 forced_placeholder.plotly_chart(fig_animation, use_container_width=True)
                 time.sleep(0.05) 
                 
@@ -733,17 +1399,8 @@ elif menu_selection == "4. Casos Extendidos (Amortiguado, Forzado, Superposició
         else:
             # Posición inicial estática
             x_initial = x_f[0]
-            fig_initial = go.Figure()
-            fig_initial.add_trace(go.Scatter(x=[-range_limit_f], y=[y_pos], mode='markers', marker=dict(size=10, color='red', symbol='square')))
-            fig_initial.add_trace(go.Scatter(x=[-range_limit_f, x_initial], y=[y_pos, y_pos], mode='lines', line=dict(color='gray', width=3, dash='dot')))
-            fig_initial.add_trace(go.Scatter(x=[x_initial], y=[y_pos], mode='markers', marker=dict(size=30, color='#25447C', symbol='square')))
-
-            fig_initial.update_layout(
-                title="Posición Inicial (Forzado)", xaxis_title='Posición X (m)', yaxis_title='',
-                xaxis_range=[-range_limit_f, range_limit_f], yaxis_range=[-0.5, 0.5], showlegend=False, template='plotly_white', height=300
-            )
-            fig_initial.update_yaxes(visible=False)
-            forced_placeholder.plotly_chart(fig_initial, use_container_width=True)
+            update_figure(fig_animation, spring_frame(range_limit_f, x_initial, y_pos), title="Posición Inicial (Forzado)")
+            forced_placeholder.plotly_chart(fig_animation, use_container_width=True)
 
         st.subheader("💡 Resonancia")
         
@@ -798,20 +1455,25 @@ elif menu_selection == "4. Casos Extendidos (Amortiguado, Forzado, Superposició
         # --- Gráfico ---
         st.subheader("📈 Gráfico de Superposición")
         
-        fig_super = go.Figure()
-        
-        fig_super.add_trace(go.Scatter(x=t_s, y=x_total, mode='lines', name='Oscilación Resultante ($x_1+x_2$)', line=dict(color='#25447C', width=2)))
-        
-        if st.checkbox("Mostrar Oscilaciones Individuales"):
-             fig_super.add_trace(go.Scatter(x=t_s, y=x1, mode='lines', name='x1', line=dict(color='#94B34A', width=1, dash='dot')))
-             fig_super.add_trace(go.Scatter(x=t_s, y=x2, mode='lines', name='x2', line=dict(color='#F89B2B', width=1, dash='dot')))
-        
-        fig_super.update_layout(
-            title='Superposición de Oscilaciones',
+        # Trazas de la resultante y, opcionalmente, de las oscilaciones individuales
+        super_styles = [dict(name='Oscilación Resultante ($x_1+x_2$)', line=dict(color='#25447C', width=2))]
+        time_axis_s = shared_time_axis(t_s)
+        super_traces = {0: series_trace(time_axis_s, x_total)}
+
+        show_individual = st.checkbox("Mostrar Oscilaciones Individuales", key="show_individual")
+        if show_individual:
+             super_styles += [
+                 dict(name='x1', line=dict(color='#94B34A', width=1, dash='dot')),
+                 dict(name='x2', line=dict(color='#F89B2B', width=1, dash='dot')),
+             ]
+             super_traces.update({1: series_trace(time_axis_s, x1), 2: series_trace(time_axis_s, x2)})
+
+        fig_super = get_figure_template('superposition', show_individual, lambda: build_line_figure(
+            super_styles,
             xaxis_title='Tiempo (s)',
-            yaxis_title='Posición (x) [m]',
-            template='plotly_white'
-        )
+            yaxis_title='Posición (x) [m]'
+        ))
+        update_figure(fig_super, super_traces, title='Superposición de Oscilaciones')
         st.plotly_chart(fig_super, use_container_width=True)
         
         st.subheader("💡 Fenómeno de Batido (Beats)")
@@ -839,6 +1501,3 @@ elif menu_selection == "4. Casos Extendidos (Amortiguado, Forzado, Superposició
             st.markdown("* Las frecuencias no son lo suficientemente cercanas para producir un fenómeno de batido claro.")
             st.markdown(f"La diferencia de frecuencia es $\\omega_{{batido}} = **{w_beat:.2f} \\text{{ rad/s}}**$.")
 
-
-st.sidebar.markdown("---")
-st.sidebar.markdown("Desarrollado por grupo el grupo E para Fisica 2")
@@ -0,0 +1,386 @@
+"""Prueba de carga del simulador MAS con sesiones concurrentes (sin navegador).
+
+Lanza N sesiones simuladas de `appMAS.py` con `streamlit.testing.v1.AppTest`
+dentro de un mismo proceso, igual que un worker de Streamlit atiende a varios
+estudiantes: comparten `st.cache_resource` (pool de solvers, pre-calentamiento)
+pero cada una tiene su propio `st.session_state`. Cada sesión recorre las cuatro
+secciones del menú, cambia parámetros, presiona los botones de animación y activa
+el modo en tiempo real de cada sistema; todas arrancan a la vez para reproducir una
+clase completa entrando al mismo tiempo.
+
+AppTest no dispara el temporizador `run_every` de los fragmentos, así que cada tic
+del modo en tiempo real se mide como una ejecución completa del script (cota
+superior del costo de un tic en el navegador, que solo vuelve a ejecutar el fragmento).
+
+Se mide el tiempo de ejecución del script en el servidor (no el envío por red):
+percentiles de latencia por acción, acciones por segundo, RSS máximo del proceso
+y tamaño de `st.session_state` por sesión. Con varios valores de N se estima
+cuántos usuarios concurrentes soporta un worker.
+
+El reporte se imprime por stdout; los avisos de Streamlit en modo sin servidor
+van a stderr y pueden descartarse.
+
+Uso:
+    python loadtestMAS.py --sessions 1 5 10 20 2>/dev/null
+    python loadtestMAS.py --sessions 1 10 --no-animations --json reporte.json
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import threading
+import time
+import types
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import streamlit
+
+# share_apptest_runtime() sustituye piezas internas de Streamlit (Runtime._instance, el Runtime y el ScriptCache
+# de app_test y local_script_runner) que cambian entre versiones menores: solo se ejecuta con la serie verificada,
+# antes de importar esos módulos internos. Debe coincidir con la cota de streamlit en requirements.txt
+SUPPORTED_STREAMLIT = (1, 66)
+if tuple(int(part) for part in streamlit.__version__.split(".")[:2]) != SUPPORTED_STREAMLIT:
+    raise SystemExit(
+        f"loadtestMAS.py usa internos de Streamlit verificados solo con "
+        f"{'.'.join(map(str, SUPPORTED_STREAMLIT))}.x (instalada: {streamlit.__version__}); "
+        f"revise share_apptest_runtime() antes de actualizar SUPPORTED_STREAMLIT"
+    )
+
+import streamlit.config
+import streamlit.testing.v1.app_test as app_test_module
+import streamlit.testing.v1.local_script_runner as local_script_runner_module
+from plotly.basedatatypes import BaseFigure
+from streamlit.runtime import Runtime
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "appMAS.py")
+
+SECTIONS = [
+    "1. Simulación Masa-Resorte",
+    "2. Simulación Péndulo Simple",
+    "3. Análisis de Parámetros ($k$ y $m$)",
+    "4. Casos Extendidos (Amortiguado, Forzado, Superposición)",
+]
+
+# Tiempo máximo por ejecución del script (las animaciones forzadas duran ~5 s)
+RUN_TIMEOUT = 120
+
+# Intervalo de muestreo de la memoria residente del proceso
+RSS_SAMPLE_INTERVAL = 0.05
+
+
+# --- Sesiones Concurrentes con AppTest ---
+
+# AppTest está pensado para una sesión a la vez: en cada `run()` instala un Runtime simulado como
+# global del proceso, lo borra al terminar y compila el script con un ScriptCache propio. Con varias
+# sesiones en hilos, una sesión que termina deja sin Runtime a las demás (árbol de elementos vacío)
+# y los `ast.parse` concurrentes fallan en CPython 3.11. Como en un servidor real, aquí se comparte
+# un único Runtime simulado y un único ScriptCache entre todas las sesiones.
+def share_apptest_runtime():
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime._instance = runtime
+
+    # AppTest asigna `Runtime._instance` sobre esta subclase, sin tocar el Runtime compartido
+    class _SessionRuntime(Runtime):
+        pass
+
+    app_test_module.Runtime = _SessionRuntime
+
+    script_cache = ScriptCache()
+    app_test_module.ScriptCache = lambda: script_cache
+    local_script_runner_module.ScriptCache = lambda: script_cache
+
+    # AppTest activa y restaura esta opción en cada `run()`; se deja fija para que no oscile entre hilos
+    streamlit.config.set_option("global.appTest", True)
+
+
+# --- Guion de Navegación ---
+
+# Lista de (acción, es_animación (botones y modo en tiempo real), función que prepara el siguiente `run()` del AppTest)
+def navigation_script(with_animations=True):
+    steps = [
+        ("1: abrir sección", False, lambda at: at.radio(key="menu_selection").set_value(SECTIONS[0])),
+        ("1: cambiar k", False, lambda at: at.number_input(key="k_mas").set_value(20.0)),
+        ("1: animación", True, lambda at: at.button(key="btn_mas_start").click()),
+        ("1: tiempo real", True, lambda at: at.toggle(key="rt_mas").set_value(True)),
+        ("1: tiempo real, tic", True, lambda at: at),
+        ("1: tiempo real, cambiar k", True, lambda at: at.number_input(key="k_mas").set_value(15.0)),
+        ("1: tiempo real, apagar", True, lambda at: at.toggle(key="rt_mas").set_value(False)),
+        ("2: abrir sección", False, lambda at: at.radio(key="menu_selection").set_value(SECTIONS[1])),
+        ("2: cambiar Θ0", False, lambda at: at.number_input(key="theta_0_deg").set_value(60.0)),
+        ("2: animación", True, lambda at: at.button(key="btn_pendulum_start").click()),
+        ("2: tiempo real", True, lambda at: at.toggle(key="rt_pendulum").set_value(True)),
+        ("2: tiempo real, tic", True, lambda at: at),
+        ("2: tiempo real, apagar", True, lambda at: at.toggle(key="rt_pendulum").set_value(False)),
+        ("3: abrir sección", False, lambda at: at.radio(key="menu_selection").set_value(SECTIONS[2])),
+        ("3: cambiar m fija", False, lambda at: at.slider(key="m_fixed_slider").set_value(2.0)),
+        ("4: abrir sección", False, lambda at: at.radio(key="menu_selection").set_value(SECTIONS[3])),
+        ("4.1: cambiar c", False, lambda at: at.number_input(key="c_d").set_value(2.0)),
+        ("4.1: animación", True, lambda at: at.button(key="btn_damped_start").click()),
+        ("4.1: tiempo real", True, lambda at: at.toggle(key="rt_damped").set_value(True)),
+        ("4.1: tiempo real, tic", True, lambda at: at),
+        ("4.1: tiempo real, cambiar c", True, lambda at: at.number_input(key="c_d").set_value(1.0)),
+        ("4.1: tiempo real, apagar", True, lambda at: at.toggle(key="rt_damped").set_value(False)),
+        ("4.2: abrir caso", False, lambda at: at.selectbox(key="extended_case").set_value("MAS Forzado")),
+        ("4.2: cambiar ω_f", False, lambda at: at.number_input(key="w_f").set_value(3.2)),
+        ("4.2: animación", True, lambda at: at.button(key="btn_forced_start").click()),
+        ("4.2: tiempo real", True, lambda at: at.toggle(key="rt_forced").set_value(True)),
+        ("4.2: tiempo real, tic", True, lambda at: at),
+        ("4.2: tiempo real, cambiar ω_f", True, lambda at: at.number_input(key="w_f").set_value(3.0)),
+        ("4.2: tiempo real, apagar", True, lambda at: at.toggle(key="rt_forced").set_value(False)),
+        ("4.3: abrir caso", False,
+         lambda at: at.selectbox(key="extended_case").set_value("Superposición de Oscilaciones")),
+        ("4.3: individuales", False, lambda at: at.checkbox(key="show_individual").check()),
+    ]
+    return [step for step in steps if with_animations or not step[1]]
+
+
+# --- Medición de Memoria ---
+
+# Memoria residente actual del proceso en bytes (Linux); None si no está disponible
+def current_rss():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+# RSS máximo histórico del proceso en bytes (ru_maxrss está en KB en Linux y en bytes en macOS)
+def peak_rss():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+# Hilo que muestrea la RSS mientras corre una ronda de la prueba y guarda el máximo observado
+class RSSSampler(threading.Thread):
+    def __init__(self):
+        super().__init__(name="rss-sampler", daemon=True)
+        self.peak = current_rss() or 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(RSS_SAMPLE_INTERVAL):
+            rss = current_rss()
+            if rss is not None:
+                self.peak = max(self.peak, rss)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        # Sin /proc solo queda el máximo histórico del proceso
+        return self.peak if current_rss() is not None else peak_rss()
+
+# Tamaño aproximado en bytes de un objeto y todo lo que alcanza (arreglos, figuras, resultados de solvers).
+# Los módulos, clases, funciones e hilos se comparten entre sesiones y no se cuentan.
+def deep_sizeof(obj):
+    shared = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+              types.MethodType, threading.Thread)
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, shared):
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+
+        if isinstance(item, np.ndarray):
+            if item.base is not None:
+                stack.append(item.base)
+        elif isinstance(item, BaseFigure):
+            # Solo los datos y el layout; los validadores de Plotly son compartidos
+            stack.extend([item._data, item._layout])
+        elif isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        else:
+            if hasattr(item, "__dict__"):
+                stack.append(item.__dict__)
+            for slot in getattr(type(item), "__slots__", ()):
+                if hasattr(item, slot):
+                    stack.append(getattr(item, slot))
+    return total
+
+
+# --- Ejecución de Sesiones ---
+
+# Recorre el guion en una sesión; devuelve latencias por acción, los errores (acción, mensaje)
+# y el tamaño final de su session_state
+def run_session(steps, start_barrier):
+    record = {"latencies": [], "errors": [], "session_state_bytes": 0}
+    at = AppTest.from_file(APP_PATH, default_timeout=RUN_TIMEOUT)
+    start_barrier.wait()
+
+    t0 = time.perf_counter()
+    at.run()
+    record["latencies"].append(("inicio", time.perf_counter() - t0))
+    record["errors"] += [("inicio", exc.message) for exc in at.exception]
+
+    for label, _, action in steps:
+        try:
+            element = action(at)
+            t0 = time.perf_counter()
+            element.run()
+            record["latencies"].append((label, time.perf_counter() - t0))
+            record["errors"] += [(label, exc.message) for exc in at.exception]
+        except Exception as exc:
+            record["errors"].append((label, f"{type(exc).__name__}: {exc}"))
+
+    record["session_state_bytes"] = deep_sizeof(dict(at.session_state.items()))
+    return record
+
+# Ejecuta una ronda con `n_sessions` sesiones concurrentes que arrancan al mismo tiempo
+def run_round(n_sessions, steps):
+    records = [None] * n_sessions
+    barrier = threading.Barrier(n_sessions + 1)
+
+    def worker(i):
+        records[i] = run_session(steps, barrier)
+
+    threads = [threading.Thread(target=worker, args=(i,), name=f"sesion-{i}") for i in range(n_sessions)]
+    for thread in threads:
+        thread.start()
+
+    rss_before = current_rss() or peak_rss()
+    sampler = RSSSampler()
+    sampler.start()
+    barrier.wait()
+    t0 = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    wall_time = time.perf_counter() - t0
+    rss_peak = sampler.stop()
+
+    return summarize_round(n_sessions, records, wall_time, rss_before, rss_peak)
+
+
+# --- Reporte ---
+
+def percentiles(values):
+    values = np.asarray(values)
+    return {
+        "p50": float(np.percentile(values, 50)),
+        "p90": float(np.percentile(values, 90)),
+        "p99": float(np.percentile(values, 99)),
+        "max": float(values.max()),
+    }
+
+def summarize_round(n_sessions, records, wall_time, rss_before, rss_peak):
+    by_action = {}
+    for record in records:
+        for label, seconds in record["latencies"]:
+            by_action.setdefault(label, []).append(seconds)
+    all_latencies = [seconds for values in by_action.values() for seconds in values]
+    state_sizes = [record["session_state_bytes"] for record in records]
+    error_counts = {}
+    for record in records:
+        for label, message in record["errors"]:
+            key = f"{label}: {message}"
+            error_counts[key] = error_counts.get(key, 0) + 1
+
+    return {
+        "sessions": n_sessions,
+        "wall_time_s": wall_time,
+        "actions": len(all_latencies),
+        "throughput_actions_per_s": len(all_latencies) / wall_time,
+        "errors": sum(error_counts.values()),
+        "error_details": error_counts,
+        "latency_s": percentiles(all_latencies),
+        "latency_by_action_s": {label: percentiles(values) for label, values in by_action.items()},
+        "rss_before_mb": rss_before / 2**20,
+        "rss_peak_mb": rss_peak / 2**20,
+        "rss_per_session_mb": max(rss_peak - rss_before, 0) / 2**20 / n_sessions,
+        "session_state_kb_mean": float(np.mean(state_sizes)) / 1024,
+        "session_state_kb_max": float(np.max(state_sizes)) / 1024,
+    }
+
+# Mayor N cuyas acciones mantienen su p90 a no más de `max_extra_latency` segundos de la mediana
+# con una sola sesión (y, si se indica, cuyo RSS máximo no supera `max_rss_mb`)
+def estimate_capacity(rounds, max_extra_latency, max_rss_mb=None):
+    reference = rounds[0]["latency_by_action_s"]
+    capacity = 0
+    for result in rounds:
+        within_latency = all(
+            stats["p90"] <= reference[label]["p50"] + max_extra_latency
+            for label, stats in result["latency_by_action_s"].items()
+            if label in reference
+        )
+        within_memory = max_rss_mb is None or result["rss_peak_mb"] <= max_rss_mb
+        if not (within_latency and within_memory and result["errors"] == 0):
+            break
+        capacity = result["sessions"]
+    return capacity
+
+def print_report(rounds, capacity, max_extra_latency):
+    print("\n=== Prueba de carga: appMAS.py ===")
+    print(f"{'N':>4} {'acc/s':>7} {'p50 [s]':>8} {'p90 [s]':>8} {'p99 [s]':>8} "
+          f"{'RSS máx [MB]':>13} {'MB/sesión':>10} {'state [KB]':>11} {'errores':>8}")
+    for r in rounds:
+        lat = r["latency_s"]
+        print(f"{r['sessions']:>4} {r['throughput_actions_per_s']:>7.2f} {lat['p50']:>8.3f} {lat['p90']:>8.3f} "
+              f"{lat['p99']:>8.3f} {r['rss_peak_mb']:>13.1f} {r['rss_per_session_mb']:>10.2f} "
+              f"{r['session_state_kb_max']:>11.1f} {r['errors']:>8}")
+
+    for r in rounds:
+        if r["error_details"]:
+            print(f"\nErrores con N={r['sessions']} (veces · acción: mensaje):")
+            for detail, count in r["error_details"].items():
+                print(f"  {count:>4} · {detail}")
+
+    last = rounds[-1]
+    print(f"\nLatencia por acción con N={last['sessions']} (p50 / p90 [s]):")
+    for label, stats in last["latency_by_action_s"].items():
+        print(f"  {label:<30} {stats['p50']:7.3f} / {stats['p90']:7.3f}")
+
+    print(f"\nCapacidad estimada: {capacity} usuarios concurrentes por worker "
+          f"(p90 de cada acción ≤ su mediana con 1 sesión + {max_extra_latency:g} s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga con sesiones concurrentes de appMAS.py")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10],
+                        help="Número de sesiones concurrentes por ronda (siempre se incluye 1 como referencia)")
+    parser.add_argument("--no-animations", action="store_true",
+                        help="Omite los botones de animación y el modo en tiempo real del guion de navegación")
+    parser.add_argument("--max-extra-latency", type=float, default=1.0,
+                        help="Segundos que el p90 de una acción puede superar su mediana con 1 sesión")
+    parser.add_argument("--max-rss-mb", type=float, default=None,
+                        help="Límite de memoria residente del worker para estimar la capacidad")
+    parser.add_argument("--json", dest="json_path", default=None,
+                        help="Ruta donde guardar el reporte completo en JSON")
+    args = parser.parse_args(argv)
+
+    share_apptest_runtime()
+    steps = navigation_script(with_animations=not args.no_animations)
+    session_counts = sorted(set(args.sessions) | {1})
+
+    # Sesión de calentamiento: importaciones y caches de proceso no deben contaminar la ronda N=1
+    run_round(1, steps)
+
+    rounds = []
+    for n_sessions in session_counts:
+        print(f"Ejecutando {n_sessions} sesión(es) concurrente(s)...", file=sys.stderr)
+        rounds.append(run_round(n_sessions, steps))
+
+    capacity = estimate_capacity(rounds, args.max_extra_latency, args.max_rss_mb)
+    print_report(rounds, capacity, args.max_extra_latency)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            report = {"rounds": rounds, "capacity": capacity, "max_extra_latency_s": args.max_extra_latency}
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()